@@ -0,0 +1,8 @@
+# Hold'em equity calculator. eval holds the hand evaluator and the
+# enumeration backends, io the config parsing and the mmap'd rank table,
+# cli the command-line entry point.
+from .eval import (EvalState, Hand, build_enumerator, calculate_equities,
+                   cards_of, evaluate_mask, get_best_hand, mask_of,
+                   sample_runouts)
+from .io import load_table, read_config, store_tables
+from .cli import main
@@ -0,0 +1,92 @@
+import math
+import sys
+
+from .eval import (CARD_ID, CARD_INT, HAVE_CEXT, HAVE_NUMBA, HAVE_NUMPY,
+                   PRIMES, bits_of, build_enumerator, build_eval7_lists,
+                   calculate_equities, cards_of, mask_of, sample_runouts)
+from .io import POSITIONS, alive_cards, load_table, read_config, store_tables
+
+# The compiled backends only exist when their dependency imported; eval.py
+# already probed for them, so these re-imports can't fail.
+if HAVE_NUMPY:
+  import numpy as np
+  from .eval import enumerate_runouts_numpy
+if HAVE_NUMBA:
+  from .eval import enumerate_runouts
+if HAVE_CEXT:
+  import evaluator as _evaluator
+
+
+def main():
+  argv = sys.argv[1:]
+  samples = 0
+  if "--samples" in argv:
+    i = argv.index("--samples")
+    if i + 1 >= len(argv) or not argv[i + 1].isdigit():
+      print("--samples needs a non-negative integer value.")
+      exit(1)
+    samples = int(argv[i + 1])
+    del argv[i:i + 2]
+  if len(argv) != 1:
+    print("usage: python main.py <config> [--samples N]")
+    exit(1)
+
+  config = read_config(argv[0])
+  alive = alive_cards(config)
+
+  state = load_table()
+  # Players live in parallel arrays rather than a dict of dicts: counters
+  # update by index and the numeric backends take the columns directly.
+  positions = [pos for pos in POSITIONS if len(config[pos]) == 2]
+  hands = [config[pos] for pos in positions]
+  hole_masks = [mask_of(hand) for hand in hands]
+  wins = [0] * len(positions)
+  ties = [0] * len(positions)
+  outcomes = 0
+
+  known_board = config['board']
+  k = 5 - len(known_board)
+  if samples and k > 0:
+    outcomes = sample_runouts(state, alive, mask_of(known_board), hole_masks,
+                              wins, ties, k, samples)
+  elif k > 0 and HAVE_NUMBA:
+    alive_arr = np.array([CARD_INT[c] for c in cards_of(alive)], dtype=np.int64)
+    holes = np.array([[CARD_INT[c] for c in hand] for hand in hands],
+                     dtype=np.int64)
+    board_arr = np.array([CARD_INT[c] for c in known_board], dtype=np.int64)
+    win_arr, tie_arr, outcomes = enumerate_runouts(
+        alive_arr, holes, board_arr, k)
+    wins = [int(count) for count in win_arr]
+    ties = [int(count) for count in tie_arr]
+  elif k > 0 and HAVE_CEXT:
+    flush7, keys, ranks = build_eval7_lists()
+    _evaluator.init_tables(flush7, keys, ranks, PRIMES)
+    wins, ties, outcomes = _evaluator.enumerate_runouts_cext(
+        bits_of(alive), hole_masks, mask_of(known_board), k)
+  elif k > 0 and HAVE_NUMPY:
+    alive_ids = np.array([CARD_ID[c] for c in cards_of(alive)], dtype=np.int64)
+    hole_ids = np.array([[CARD_ID[c] for c in hand] for hand in hands],
+                        dtype=np.int64)
+    board_ids = np.array([CARD_ID[c] for c in known_board], dtype=np.int64)
+    wins, ties, outcomes = enumerate_runouts_numpy(
+        alive_ids, hole_ids, board_ids, k)
+  else:
+    # Winner determination is fused into a loop generated for this exact
+    # spot: k nested combination loops, one rank lookup per player. A
+    # complete board is just the k=0 specialization that runs once.
+    enumerate_specialized = build_enumerator(state, k, len(positions))
+    outcomes = enumerate_specialized(
+        bits_of(alive), mask_of(known_board), hole_masks, wins, ties)
+
+  win_rates, tie_rates = calculate_equities(wins, ties, outcomes)
+  for i, hand in enumerate(hands):
+    lines = [f"{hand} -->"]
+    for outcome, rate in (("win", win_rates[i]), ("tie", tie_rates[i])):
+      line = f" {outcome}={(100 * rate):.2f}"
+      if samples:
+        # Sampling is an estimate, so report the 95% confidence interval.
+        line += f" ±{(100 * 1.96 * math.sqrt(rate * (1 - rate) / outcomes)):.2f}"
+      lines.append(line)
+    print("\n".join(lines))
+
+  store_tables(state)
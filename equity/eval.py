@@ -0,0 +1,722 @@
+from dataclasses import dataclass, field
+from enum import IntEnum
+import itertools
+import math
+import random
+
+# numpy and numba are both optional. With numba the whole enumeration loop
+# runs as compiled native code; with just numpy it runs vectorized in C; with
+# neither we fall back to the pure-Python loop.
+try:
+  import numpy as np
+  HAVE_NUMPY = True
+except ImportError:
+  HAVE_NUMPY = False
+try:
+  from numba import njit, prange
+  HAVE_NUMBA = True
+except ImportError:
+  HAVE_NUMBA = False
+# Compiled evaluator extension (see evaluator.pyx); built locally with
+# `python setup.py build_ext --inplace` and optional like the others.
+try:
+  import evaluator as _evaluator
+  HAVE_CEXT = True
+except ImportError:
+  HAVE_CEXT = False
+
+SUITS = ["h", "d", "s", "c"]
+CARDINALITIES = ["2", "3", "4", "5", "6",
+                 "7", "8", "9", "T", "J", "Q", "K", "A"]
+
+# Card i is the card with rank i // 4 and suit i % 4. Any collection of cards
+# is a single 52-bit mask with bit i set, so set algebra on hands is plain
+# integer bitwise math instead of building Python sets.
+CARD_ID = {c + s: r * 4 + i
+           for r, c in enumerate(CARDINALITIES) for i, s in enumerate(SUITS)}
+CARDS_BY_ID = tuple(sorted(CARD_ID, key=CARD_ID.get))
+CARD_BIT = {card: 1 << id for card, id in CARD_ID.items()}
+FULL_DECK_MASK = (1 << 52) - 1
+SUIT_MASKS = [sum(1 << (r * 4) for r in range(13)) << s for s in range(4)]
+
+
+def mask_of(cards):
+  mask = 0
+  for card in cards:
+    mask |= CARD_BIT[card]
+  return mask
+
+
+def cards_of(mask):
+  cards = []
+  while mask:
+    low = mask & -mask
+    cards.append(CARDS_BY_ID[low.bit_length() - 1])
+    mask ^= low
+  return cards
+
+
+def bits_of(mask):
+  bits = []
+  while mask:
+    low = mask & -mask
+    bits.append(low)
+    mask ^= low
+  return bits
+
+
+def colex_index(mask):
+  # Colexicographic rank of the subset: sum of C(id_i, i) over the set bits
+  # in ascending order. A perfect hash onto [0, C(52, n)).
+  index = 0
+  i = 1
+  while mask:
+    low = mask & -mask
+    index += math.comb(low.bit_length() - 1, i)
+    i += 1
+    mask ^= low
+  return index
+
+
+# Strength by cardinality, precomputed once: a dict get instead of an O(13)
+# list.index per call. Unknown cardinalities are a config error and get
+# caught by validate_config, not here.
+STRENGTH = {c: i for i, c in enumerate(CARDINALITIES)}
+
+
+def get_cardinality_strength(cardinality):
+  return STRENGTH[cardinality]
+
+
+class Hand(IntEnum):
+  ROYAL_FLUSH = 10
+  STRAIGHT_FLUSH = 9
+  QUADS = 8
+  FULL_HOUSE = 7
+  FLUSH = 6
+  STRAIGHT = 5
+  THREE_OF_KIND = 4
+  TWO_PAIR = 3
+  PAIR = 2
+  HIGH_CARD = 1
+
+
+# Every card is encoded Cactus-Kev style as a 32-bit int:
+#
+#   xxxbbbbb bbbbbbbb cdhsrrrr xxpppppp
+#
+# `b` is a one-hot rank bit, the suit is one-hot across four bits, `rrrr` is
+# the rank index, and `pppppp` is the rank's prime. The prime product of five
+# cards uniquely identifies their rank multiset, so a 5-card hand's strength
+# is a single table lookup.
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+
+def make_card_int(rank, suit):
+  return (1 << (16 + rank)) | (1 << (12 + suit)) | (rank << 8) | PRIMES[rank]
+
+
+CARD_INT = {c + s: make_card_int(get_cardinality_strength(c), SUITS.index(s))
+            for s in SUITS for c in CARDINALITIES}
+
+
+def straight_rank_sets():
+  # Best straight first. The wheel's top card is the five.
+  sets = [[t, t - 1, t - 2, t - 3, t - 4] for t in range(12, 3, -1)]
+  sets.append([3, 2, 1, 0, 12])
+  return sets
+
+
+# STRAIGHT_LUT[m] holds the top rank of the best straight contained in the
+# 13-bit rank mask m, or 0 when m holds no straight. A straight can never
+# top out at the deuce, so 0 is unambiguous.
+STRAIGHT_LUT = [0] * 8192
+
+
+def build_straight_lut():
+  for m in range(8192):
+    for i in range(8, -1, -1):
+      if (m >> i) & 0x1F == 0x1F:
+        STRAIGHT_LUT[m] = i + 4
+        break
+    else:
+      if m & 0x100F == 0x100F:
+        STRAIGHT_LUT[m] = 3  # the wheel tops out at the five
+  return STRAIGHT_LUT
+
+
+build_straight_lut()
+
+
+# Software PEXT for the suit lanes: SUIT_PROJ compresses the bits at
+# positions 0, 4, 8, 12 of a 16-bit chunk into four contiguous bits, so
+# projecting a 52-bit mask onto 13 rank bits is four lookups instead of a
+# loop over the ranks.
+def build_suit_proj():
+  table = [0] * 65536
+  for x in range(65536):
+    table[x] = (x & 1) | ((x >> 3) & 2) | ((x >> 6) & 4) | ((x >> 9) & 8)
+  return table
+
+
+SUIT_PROJ = build_suit_proj()
+
+
+def project_lane(m):
+  return (SUIT_PROJ[m & 0xFFFF]
+          | SUIT_PROJ[(m >> 16) & 0xFFFF] << 4
+          | SUIT_PROJ[(m >> 32) & 0xFFFF] << 8
+          | SUIT_PROJ[(m >> 48) & 0xFFFF] << 12)
+
+
+def rank_bits(mask):
+  # Project a 52-bit card mask down to the 13 ranks present in it.
+  return project_lane(mask | mask >> 1 | mask >> 2 | mask >> 3)
+
+
+# Inverse of the projection: spread 13 contiguous bits back onto the
+# positions 0, 4, 8, ... of a suit lane.
+def build_suit_spread():
+  table = [0] * 8192
+  for word in range(8192):
+    spread = 0
+    bits = word
+    while bits:
+      low = bits & -bits
+      spread |= 1 << ((low.bit_length() - 1) * 4)
+      bits ^= low
+    table[word] = spread
+  return table
+
+
+SUIT_SPREAD = build_suit_spread()
+
+
+def canonical_from_words(w0, w1, w2, w3):
+  # Repack four already-projected 13-bit suit words into a canonical mask.
+  # Split out of canonical_mask so callers that share a partial hand across
+  # several evaluations can project it once and pass the words in.
+  words = sorted((w0, w1, w2, w3))
+  canonical = 0
+  for s in range(4):
+    canonical |= SUIT_SPREAD[words[s]] << s
+  return canonical
+
+
+def canonical_mask(mask):
+  # Suits are interchangeable for ranking, so relabel them into a canonical
+  # order: pull out the four 13-bit suit words, sort them, and repack. All
+  # suit-isomorphic hands collapse onto one key, which multiplies the hit
+  # rate of the memo and the density of the rank table.
+  return canonical_from_words(suit_rank_bits(mask, 0), suit_rank_bits(mask, 1),
+                              suit_rank_bits(mask, 2), suit_rank_bits(mask, 3))
+
+
+def suit_rank_bits(mask, suit):
+  # The 13 ranks mask holds in one suit. Other suits' bits shift to
+  # positions the projection never reads, so no pre-masking is needed.
+  return project_lane(mask >> suit)
+
+
+# FLUSH_LUT is indexed by the 13-bit rank pattern of five suited cards.
+# UNSUITED_LUT is keyed by the prime product of any other five cards. Ranks
+# run from 7462 (royal flush) down to 1 (seven-five high); a bigger rank
+# always beats a smaller one.
+FLUSH_LUT = [0] * 8192
+UNSUITED_LUT = {}
+
+
+def build_luts():
+  straights = straight_rank_sets()
+  # `distinct` enumerates every 5-distinct-rank hand from best to worst:
+  # combinations of a descending sequence come out in descending
+  # highest-card-first order, which is exactly kicker order.
+  distinct = list(itertools.combinations(range(12, -1, -1), 5))
+  non_straights = [c for c in distinct
+                   if not STRAIGHT_LUT[sum(1 << r for r in c)]]
+
+  def others(excluded):
+    return [r for r in range(12, -1, -1) if r not in excluded]
+
+  sections = [
+      (Hand.ROYAL_FLUSH, "flush", straights[:1]),
+      (Hand.STRAIGHT_FLUSH, "flush", straights[1:]),
+      (Hand.QUADS, "prime", [[q] * 4 + [k] for q in range(12, -1, -1)
+                             for k in others([q])]),
+      (Hand.FULL_HOUSE, "prime", [[t] * 3 + [p] * 2 for t in range(12, -1, -1)
+                                  for p in others([t])]),
+      (Hand.FLUSH, "flush", non_straights),
+      (Hand.STRAIGHT, "prime", straights),
+      (Hand.THREE_OF_KIND, "prime",
+       [[t] * 3 + list(ks) for t in range(12, -1, -1)
+        for ks in itertools.combinations(others([t]), 2)]),
+      (Hand.TWO_PAIR, "prime",
+       [[hi] * 2 + [lo] * 2 + [k]
+        for hi, lo in itertools.combinations(range(12, -1, -1), 2)
+        for k in others([hi, lo])]),
+      (Hand.PAIR, "prime", [[p] * 2 + list(ks) for p in range(12, -1, -1)
+                            for ks in itertools.combinations(others([p]), 3)]),
+      (Hand.HIGH_CARD, "prime", non_straights),
+  ]
+  rank = 7462
+  for _, lut, hands in sections:
+    for ranks in hands:
+      if lut == "flush":
+        FLUSH_LUT[sum(1 << r for r in ranks)] = rank
+      else:
+        product = 1
+        for r in ranks:
+          product *= PRIMES[r]
+        UNSUITED_LUT[product] = rank
+      rank -= 1
+  assert rank == 0, "Expected exactly 7462 hand classes."
+
+
+build_luts()
+
+
+if HAVE_NUMBA:
+  # njit can't reach into Python dicts, so the LUTs get mirrored into arrays:
+  # the flush table stays directly indexed and the unsuited table becomes a
+  # sorted key array probed with binary search.
+  FLUSH_ARR = np.array(FLUSH_LUT, dtype=np.int16)
+  _unsuited = sorted(UNSUITED_LUT.items())
+  UNSUITED_KEYS = np.array([key for key, _ in _unsuited], dtype=np.int64)
+  UNSUITED_RANKS = np.array([rank for _, rank in _unsuited], dtype=np.int16)
+
+  @njit(cache=True)
+  def eval_best(cards):
+    n = cards.shape[0]
+    best = 0
+    for i1 in range(n - 4):
+      for i2 in range(i1 + 1, n - 3):
+        for i3 in range(i2 + 1, n - 2):
+          for i4 in range(i3 + 1, n - 1):
+            for i5 in range(i4 + 1, n):
+              c1 = cards[i1]
+              c2 = cards[i2]
+              c3 = cards[i3]
+              c4 = cards[i4]
+              c5 = cards[i5]
+              if c1 & c2 & c3 & c4 & c5 & 0xF000:
+                rank = FLUSH_ARR[(c1 | c2 | c3 | c4 | c5) >> 16]
+              else:
+                product = ((c1 & 0xFF) * (c2 & 0xFF) * (c3 & 0xFF)
+                           * (c4 & 0xFF) * (c5 & 0xFF))
+                rank = UNSUITED_RANKS[
+                    np.searchsorted(UNSUITED_KEYS, product)]
+              if rank > best:
+                best = rank
+    return best
+
+  @njit(cache=True, parallel=True)
+  def enumerate_runouts(alive, holes, board, k):
+    # Walks every k-subset of `alive` with an index odometer (no itertools,
+    # no allocation per combination) and scores every player on each runout.
+    # Runouts are independent, so combinations are split across threads by
+    # their first card index; every slice writes its own accumulator row (no
+    # races) and the rows are summed afterwards.
+    n = alive.shape[0]
+    n_players = holes.shape[0]
+    n_board = board.shape[0]
+    n_first = n - k + 1
+    wins2 = np.zeros((n_first, n_players), dtype=np.int64)
+    ties2 = np.zeros((n_first, n_players), dtype=np.int64)
+    counts = np.zeros(n_first, dtype=np.int64)
+    for i0 in prange(n_first):
+      cards = np.empty(7, dtype=np.int64)
+      ranks = np.empty(n_players, dtype=np.int32)
+      idx = np.empty(k, dtype=np.int64)
+      for i in range(k):
+        idx[i] = i0 + i
+      while True:
+        for j in range(n_board):
+          cards[j] = board[j]
+        for j in range(k):
+          cards[n_board + j] = alive[idx[j]]
+        for p in range(n_players):
+          cards[5] = holes[p, 0]
+          cards[6] = holes[p, 1]
+          ranks[p] = eval_best(cards)
+        best = ranks[0]
+        for p in range(1, n_players):
+          if ranks[p] > best:
+            best = ranks[p]
+        count = 0
+        for p in range(n_players):
+          if ranks[p] == best:
+            count += 1
+        for p in range(n_players):
+          if ranks[p] == best:
+            if count == 1:
+              wins2[i0, p] += 1
+            else:
+              ties2[i0, p] += 1
+        counts[i0] += 1
+        # Only positions past the pinned first index advance.
+        i = k - 1
+        while i >= 1 and idx[i] == n - k + i:
+          i -= 1
+        if i < 1:
+          break
+        idx[i] += 1
+        for j in range(i + 1, k):
+          idx[j] = idx[j - 1] + 1
+    wins = np.zeros(n_players, dtype=np.int64)
+    ties = np.zeros(n_players, dtype=np.int64)
+    outcomes = 0
+    for r in range(n_first):
+      outcomes += counts[r]
+      for p in range(n_players):
+        wins[p] += wins2[r, p]
+        ties[p] += ties2[r, p]
+    return wins, ties, outcomes
+
+
+if HAVE_NUMPY:
+  # Per-card tables for the vectorized path. WORD_BY_ID packs a card's rank
+  # bit into a 13-bit lane per suit, so OR-reducing seven cards yields all
+  # four suit rank words in one int64.
+  PRIME_BY_ID = np.array([PRIMES[i // 4] for i in range(52)], dtype=np.int64)
+  WORD_BY_ID = np.array(
+      [(1 << (i // 4)) << (13 * (i % 4)) for i in range(52)], dtype=np.int64)
+  EVAL7_KEYS = None
+  EVAL7_RANKS = None
+  FLUSH7_LUT = None
+
+  def build_eval7_tables():
+    global EVAL7_KEYS, EVAL7_RANKS, FLUSH7_LUT
+    if EVAL7_KEYS is not None:
+      return
+    flush7, keys, ranks = build_eval7_lists()
+    EVAL7_KEYS = np.array(keys, dtype=np.int64)
+    EVAL7_RANKS = np.array(ranks, dtype=np.int16)
+    FLUSH7_LUT = np.array(flush7, dtype=np.int16)
+
+  def enumerate_runouts_numpy(alive_ids, hole_ids, board_ids, k):
+    # Evaluates every runout for every player as whole-array operations,
+    # chunked to keep the working set bounded.
+    build_eval7_tables()
+    n_players = len(hole_ids)
+    wins = [0] * n_players
+    ties = [0] * n_players
+    outcomes = 0
+    board_word = np.bitwise_or.reduce(WORD_BY_ID[board_ids]) if len(
+        board_ids) else 0
+    board_prime = int(PRIME_BY_ID[board_ids].prod()) if len(board_ids) else 1
+    player_word = [int(board_word | np.bitwise_or.reduce(WORD_BY_ID[hole]))
+                   for hole in hole_ids]
+    player_prime = [board_prime * int(PRIME_BY_ID[hole].prod())
+                    for hole in hole_ids]
+    combo_iter = itertools.combinations(alive_ids.tolist(), k)
+    chunk_size = 1 << 16
+    while True:
+      flat = np.fromiter(
+          itertools.chain.from_iterable(itertools.islice(
+              combo_iter, chunk_size)), dtype=np.int64)
+      if flat.size == 0:
+        break
+      combos = flat.reshape(-1, k)
+      runout_word = np.bitwise_or.reduce(WORD_BY_ID[combos], axis=1)
+      runout_prime = PRIME_BY_ID[combos].prod(axis=1)
+      ranks = np.empty((n_players, len(combos)), dtype=np.int16)
+      for p in range(n_players):
+        rank = EVAL7_RANKS[
+            np.searchsorted(EVAL7_KEYS, runout_prime * player_prime[p])]
+        words = runout_word | player_word[p]
+        for s in range(4):
+          lane = (words >> (13 * s)) & 0x1FFF
+          flush = np.bitwise_count(lane) >= 5
+          if flush.any():
+            rank = np.where(flush, FLUSH7_LUT[lane], rank)
+        ranks[p] = rank
+      best = ranks.max(axis=0)
+      is_best = ranks == best
+      n_best = is_best.sum(axis=0)
+      for p in range(n_players):
+        wins[p] += int(np.count_nonzero(is_best[p] & (n_best == 1)))
+        ties[p] += int(np.count_nonzero(is_best[p] & (n_best > 1)))
+      outcomes += len(combos)
+    return wins, ties, outcomes
+
+
+def top_bits(bits, n):
+  # Keep only the n highest set bits.
+  kept = 0
+  for _ in range(n):
+    top = bits.bit_length() - 1
+    kept |= 1 << top
+    bits ^= 1 << top
+  return kept
+
+
+def rank_product(bits):
+  product = 1
+  while bits:
+    low = bits & -bits
+    product *= PRIMES[low.bit_length() - 1]
+    bits ^= low
+  return product
+
+
+def straight_pattern(top):
+  return 0x100F if top == 3 else 0x1F << (top - 4)
+
+
+# Pairing category by count signature: how many ranks appear 4, 3 and 2
+# times fully determines it, so detection is one dict lookup instead of a
+# cascade of per-category checks. Flushes and straights sit outside the
+# signature and are handled by the caller.
+def build_category_lut():
+  categories = {}
+  for n4 in range(2):
+    for n3 in range(3):
+      for n2 in range(4):
+        if n4:
+          category = Hand.QUADS
+        elif n3 and (n3 > 1 or n2):
+          category = Hand.FULL_HOUSE
+        elif n3:
+          category = Hand.THREE_OF_KIND
+        elif n2 > 1:
+          category = Hand.TWO_PAIR
+        elif n2:
+          category = Hand.PAIR
+        else:
+          category = Hand.HIGH_CARD
+        categories[(n4, n3, n2)] = category
+  return categories
+
+
+CATEGORY_BY_COUNTS = build_category_lut()
+
+
+def evaluate_mask(mask):
+  # Evaluates a 5-7 card mask directly: no 5-card subsets. The card layout
+  # makes the mask its own rank histogram — summing the four shifted suit
+  # lanes packs each rank's count into its nibble, and SWAR masks on the
+  # nibbles classify the hand. The existing LUTs then supply the rank.
+  for s in range(4):
+    suited = mask & SUIT_MASKS[s]
+    if suited.bit_count() >= 5:
+      word = suit_rank_bits(mask, s)
+      top = STRAIGHT_LUT[word]
+      if top:
+        return FLUSH_LUT[straight_pattern(top)]
+      return FLUSH_LUT[top_bits(word, 5)]
+  lane = SUIT_MASKS[0]
+  hist = 0
+  for s in range(4):
+    hist += (mask >> s) & lane
+  rbits = rank_bits(mask)
+  quads = hist & 0x4444444444444  # nibbles with their 4-bit set
+  trips = hist & (hist >> 1) & lane  # nibbles equal to 3
+  pairs = (hist >> 1) & ~hist & lane  # nibbles equal to 2
+  category = CATEGORY_BY_COUNTS[
+      (quads.bit_count(), trips.bit_count(), pairs.bit_count())]
+  if category < Hand.STRAIGHT:
+    top = STRAIGHT_LUT[rbits]
+    if top:
+      return UNSUITED_LUT[rank_product(straight_pattern(top))]
+  if category == Hand.QUADS:
+    q = (quads.bit_length() - 3) // 4
+    kicker = (rbits & ~(1 << q)).bit_length() - 1
+    return UNSUITED_LUT[PRIMES[q] ** 4 * PRIMES[kicker]]
+  if category == Hand.FULL_HOUSE:
+    t = (trips.bit_length() - 1) // 4
+    boats = (trips ^ (1 << (t * 4))) | pairs
+    p = (boats.bit_length() - 1) // 4
+    return UNSUITED_LUT[PRIMES[t] ** 3 * PRIMES[p] ** 2]
+  if category == Hand.THREE_OF_KIND:
+    t = (trips.bit_length() - 1) // 4
+    kickers = top_bits(rbits & ~(1 << t), 2)
+    return UNSUITED_LUT[PRIMES[t] ** 3 * rank_product(kickers)]
+  if category == Hand.TWO_PAIR:
+    hi = (pairs.bit_length() - 1) // 4
+    lo = ((pairs ^ (1 << (hi * 4))).bit_length() - 1) // 4
+    kicker = (rbits & ~(1 << hi) & ~(1 << lo)).bit_length() - 1
+    return UNSUITED_LUT[PRIMES[hi] ** 2 * PRIMES[lo] ** 2 * PRIMES[kicker]]
+  if category == Hand.PAIR:
+    hi = (pairs.bit_length() - 1) // 4
+    kickers = top_bits(rbits ^ (1 << hi), 3)
+    return UNSUITED_LUT[PRIMES[hi] ** 2 * rank_product(kickers)]
+  return UNSUITED_LUT[rank_product(top_bits(rbits, 5))]
+
+
+EVAL7_LISTS = None
+
+
+def build_eval7_lists():
+  # Tables shared by the compiled and vectorized backends: a dense flush
+  # table over 13-bit suit words, and sorted (prime product -> rank) arrays
+  # covering every 7-card rank multiset — with no flush, the multiset alone
+  # decides the hand, and the product of seven rank primes identifies it.
+  global EVAL7_LISTS
+  if EVAL7_LISTS is not None:
+    return EVAL7_LISTS
+  flush7 = [0] * 8192
+  for word in range(8192):
+    if word.bit_count() >= 5:
+      top = STRAIGHT_LUT[word]
+      pattern = straight_pattern(top) if top else top_bits(word, 5)
+      flush7[word] = FLUSH_LUT[pattern]
+  entries = []
+  for multiset in itertools.combinations_with_replacement(range(13), 7):
+    if any(multiset.count(r) > 4 for r in set(multiset)):
+      continue
+    # Deal suits round robin so no suit reaches five cards; the histogram
+    # evaluator then scores the multiset flush-free.
+    mask = 0
+    product = 1
+    for i, r in enumerate(multiset):
+      mask |= 1 << (r * 4 + i % 4)
+      product *= PRIMES[r]
+    entries.append((product, evaluate_mask(mask)))
+  entries.sort()
+  EVAL7_LISTS = (flush7, [product for product, _ in entries],
+                 [rank for _, rank in entries])
+  return EVAL7_LISTS
+
+
+@dataclass
+class EvalState:
+  # All mutable evaluation state in one explicit object instead of module
+  # globals: the mmap'd rank table (None runs table-less) and the in-memory
+  # memo in front of it, keyed by card mask — hashing a small int is a
+  # single op, and a hit skips both the colex arithmetic and the page
+  # access.
+  cache: object = None
+  memo: dict = field(default_factory=dict)
+
+
+def rank_of_canonical(state, mask):
+  # Rank lookup for an already-canonical mask: memo first, then the mmap'd
+  # table, computing and backfilling the slot on a miss.
+  rank = state.memo.get(mask)
+  if rank is not None:
+    return rank
+  if state.cache is None:
+    rank = evaluate_mask(mask)
+  else:
+    offset = colex_index(mask) * 4
+    rank = int.from_bytes(state.cache[offset:offset + 4], "little")
+    if rank == 0:
+      rank = evaluate_mask(mask)
+      state.cache[offset:offset + 4] = rank.to_bytes(4, "little")
+  state.memo[mask] = rank
+  return rank
+
+
+def get_best_hand(state, mask):
+  return rank_of_canonical(state, canonical_mask(mask))
+
+
+def hole_words(hole_masks):
+  # The hole cards never change across runouts, so their suit words are
+  # projected exactly once per player up front.
+  return [(suit_rank_bits(hole, 0), suit_rank_bits(hole, 1),
+           suit_rank_bits(hole, 2), suit_rank_bits(hole, 3))
+          for hole in hole_masks]
+
+
+def score_runout(state, board_mask, holes, wins, ties, ranks):
+  # One fused pass: rank every player, then count the runout as a win for a
+  # sole best hand or a tie for each player sharing it. The board is shared
+  # by every player, so its suit words are projected once here and each
+  # player only ORs in its precomputed hole words.
+  w0 = suit_rank_bits(board_mask, 0)
+  w1 = suit_rank_bits(board_mask, 1)
+  w2 = suit_rank_bits(board_mask, 2)
+  w3 = suit_rank_bits(board_mask, 3)
+  for i, (h0, h1, h2, h3) in enumerate(holes):
+    ranks[i] = rank_of_canonical(
+        state, canonical_from_words(w0 | h0, w1 | h1, w2 | h2, w3 | h3))
+  best = max(ranks)
+  counters = wins if ranks.count(best) == 1 else ties
+  for i, rank in enumerate(ranks):
+    if rank == best:
+      counters[i] += 1
+
+
+def sample_runouts(state, alive, board_mask, hole_masks, wins, ties, k,
+                   samples):
+  # Monte Carlo mode for deep runouts: Floyd's algorithm draws a uniform
+  # k-subset of the alive cards per sample without shuffling the deck, and
+  # each sample is scored by the same fused pass as full enumeration.
+  bits = bits_of(alive)
+  n = len(bits)
+  ranks = [0] * len(hole_masks)
+  holes = hole_words(hole_masks)
+  for _ in range(samples):
+    subset = 0
+    for j in range(n - k, n):
+      bit = bits[random.randrange(j + 1)]
+      if subset & bit:
+        bit = bits[j]
+      subset |= bit
+    score_runout(state, board_mask | subset, holes, wins, ties, ranks)
+  return samples
+
+
+def build_enumerator(state, k, n_players):
+  # The shape of the interpreted enumeration is fixed once the config is
+  # read: k nested combination loops and n_players rank lookups per runout.
+  # Generating and exec-ing a loop specialized to those constants lets
+  # CPython run straight-line locals instead of generic subset iteration,
+  # with the partial board mask hoisted out of each loop level.
+  lines = [
+      "def enumerate_specialized(bits, board_mask, holes, wins, ties):",
+      "  n = len(bits)",
+      "  proj = suit_rank_bits",
+      "  canon = canonical_from_words",
+      "  rank = rank_of_canonical",
+      "  words = hole_words(holes)",
+  ]
+  for p in range(n_players):
+    lines.append(f"  h{p}0, h{p}1, h{p}2, h{p}3 = words[{p}]")
+  lines.append("  outcomes = 0")
+  indent = "  "
+  runout = "board_mask"
+  for j in range(k):
+    low = "0" if j == 0 else f"i{j - 1} + 1"
+    high = "n" if j == k - 1 else f"n - {k - 1 - j}"
+    lines.append(f"{indent}for i{j} in range({low}, {high}):")
+    indent += "  "
+    lines.append(f"{indent}m{j} = {runout} | bits[i{j}]")
+    runout = f"m{j}"
+  # The runout is shared by every player: project its suit words once per
+  # runout, then each player's key is four ORs against its hole words.
+  for s in range(4):
+    lines.append(f"{indent}w{s} = proj({runout}, {s})")
+  for p in range(n_players):
+    key = ", ".join(f"w{s} | h{p}{s}" for s in range(4))
+    lines.append(f"{indent}r{p} = rank(state, canon({key}))")
+  lines.append(f"{indent}best = r0")
+  for p in range(1, n_players):
+    lines.append(f"{indent}if r{p} > best:")
+    lines.append(f"{indent}  best = r{p}")
+  count = " + ".join(f"(r{p} == best)" for p in range(n_players))
+  lines.append(f"{indent}if {count} == 1:")
+  branch = "if"
+  for p in range(n_players):
+    lines.append(f"{indent}  {branch} r{p} == best:")
+    lines.append(f"{indent}    wins[{p}] += 1")
+    branch = "elif"
+  lines.append(f"{indent}else:")
+  for p in range(n_players):
+    lines.append(f"{indent}  if r{p} == best:")
+    lines.append(f"{indent}    ties[{p}] += 1")
+  lines.append(f"{indent}outcomes += 1")
+  lines.append("  return outcomes")
+  namespace = {"suit_rank_bits": suit_rank_bits,
+               "canonical_from_words": canonical_from_words,
+               "rank_of_canonical": rank_of_canonical,
+               "hole_words": hole_words, "state": state}
+  exec(compile("\n".join(lines), "<enumerator>", "exec"), namespace)
+  return namespace["enumerate_specialized"]
+
+
+def calculate_equities(wins, ties, total_outcomes):
+  win_rates = [count / total_outcomes for count in wins]
+  tie_rates = [count / total_outcomes for count in ties]
+  return win_rates, tie_rates
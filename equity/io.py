@@ -0,0 +1,91 @@
+import json
+import math
+import mmap
+import os
+
+from .eval import CARD_ID, EvalState, FULL_DECK_MASK, mask_of
+
+POSITIONS = ["btn", "sb", "bb", "utg", "mp", "co"]
+
+CONFIG_KEYS = [*POSITIONS, "board", "dead"]
+
+# The rank table is a flat binary file of one little-endian int32 per 7-card
+# subset of the deck, addressed by the subset's colex index. 0 marks an empty
+# slot (valid ranks start at 1). The file is sparse until slots get written,
+# and mmap gives O(1) access with no startup parse.
+TABLE = "./db/table.bin"
+TABLE_ENTRIES = math.comb(52, 7)
+
+
+def validate_config(config):
+  for key in CONFIG_KEYS:
+    if key not in config:
+      print(f"Config missing key '{key}'.")
+      exit(1)
+  seen_cards = {}
+  count_players = 0
+  for key, values in config.items():
+    if key not in CONFIG_KEYS:
+      print(f"Config contains unknown key '{key}'.")
+      exit(1)
+    values_count = len(values)
+    if key in POSITIONS:
+      if values_count != 0 and values_count != 2:
+        print(
+            f"Position '{key}' must either have 0 or 2 cards in the hole. Has: {values_count}.")
+        exit(1)
+      if values_count == 2:
+        count_players += 1
+    elif key == "board" and values_count > 5:
+      print(f"'board' has too many cards: {values_count}.")
+      exit(1)
+    for card in values:
+      if card not in CARD_ID:
+        print(f"Uknown card '{card}' in '{key}'.")
+        exit(1)
+      if card in seen_cards:
+        print(
+            f"'{card}' in '{key}' is a duplicate (also in '{seen_cards[card]}').")
+        exit(1)
+      seen_cards[card] = key
+  if count_players <= 1:
+    print(f"Can't calculate equity with a {count_players}-player spot.")
+    exit(1)
+
+
+def read_config(file_path):
+  with open(file_path, "r") as f:
+    config = json.load(f)
+    validate_config(config)
+    return config
+
+
+def alive_cards(config):
+  dead = 0
+  for cards in config.values():
+    dead |= mask_of(cards)
+  return ~dead & FULL_DECK_MASK
+
+
+def load_table():
+  print("loading cache... ", end='')
+  if not os.path.exists(TABLE):
+    os.makedirs(os.path.dirname(TABLE), exist_ok=True)
+    with open(TABLE, "wb") as f:
+      # Truncating up-front leaves a sparse file: unwritten slots cost no
+      # disk until they're filled in.
+      f.truncate(TABLE_ENTRIES * 4)
+  with open(TABLE, "r+b") as f:
+    state = EvalState(cache=mmap.mmap(f.fileno(), 0))
+  print("done.")
+  return state
+
+
+def store_tables(state):
+  if state.cache is None:
+    return
+  print("writing cache... ", end='')
+  # Stores are in-place through the mapping; flushing just makes them
+  # durable now rather than whenever the OS gets around to it.
+  state.cache.flush()
+  print("done.")
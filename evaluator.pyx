@@ -0,0 +1,154 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+# cython: language_level=3
+#
+# Compiled hot path: the 7-card mask evaluator and the runout enumeration
+# loop as plain C. Tables are pushed in once from main.py via init_tables so
+# the LUT construction stays in one place on the Python side.
+
+from cython.parallel cimport prange
+from libc.stdint cimport int64_t, uint16_t, uint64_t
+from libc.stdlib cimport calloc, free, malloc
+
+cdef extern from *:
+    int __builtin_ctzll(unsigned long long) nogil
+
+cdef uint16_t FLUSH7[8192]
+cdef int64_t *EVAL7_KEYS = NULL
+cdef uint16_t *EVAL7_RANKS = NULL
+cdef int N_KEYS = 0
+cdef int64_t PRIME_BY_RANK[13]
+
+
+def init_tables(flush7, keys, ranks, primes):
+    global EVAL7_KEYS, EVAL7_RANKS, N_KEYS
+    cdef int i
+    if EVAL7_KEYS != NULL:
+        return
+    for i in range(8192):
+        FLUSH7[i] = flush7[i]
+    for i in range(13):
+        PRIME_BY_RANK[i] = primes[i]
+    N_KEYS = len(keys)
+    EVAL7_KEYS = <int64_t *>malloc(N_KEYS * sizeof(int64_t))
+    EVAL7_RANKS = <uint16_t *>malloc(N_KEYS * sizeof(uint16_t))
+    for i in range(N_KEYS):
+        EVAL7_KEYS[i] = keys[i]
+        EVAL7_RANKS[i] = ranks[i]
+
+
+cdef inline int eval7_mask(uint64_t mask) nogil:
+    cdef int s, r, count, lo, hi, mid
+    cdef unsigned int word, v
+    cdef uint64_t rest
+    cdef int64_t product
+    for s in range(4):
+        word = 0
+        for r in range(13):
+            word |= (<unsigned int>((mask >> (r * 4 + s)) & 1)) << r
+        count = 0
+        v = word
+        while v:
+            v &= v - 1
+            count += 1
+        if count >= 5:
+            return FLUSH7[word]
+    product = 1
+    rest = mask
+    while rest:
+        product *= PRIME_BY_RANK[__builtin_ctzll(rest) >> 2]
+        rest &= rest - 1
+    lo = 0
+    hi = N_KEYS - 1
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if EVAL7_KEYS[mid] < product:
+            lo = mid + 1
+        else:
+            hi = mid
+    return EVAL7_RANKS[lo]
+
+
+def eval7(mask):
+    # Rank of a 7-card mask; init_tables must have been called.
+    return eval7_mask(mask)
+
+
+def enumerate_runouts_cext(alive_bits, hole_masks, board_mask, k):
+    # Walks every k-subset of the alive cards with an index odometer and
+    # scores each player per runout, all in C. Runouts are independent, so
+    # combinations are chunked across OpenMP threads by their first card
+    # index; every slice writes its own accumulator row (no locks, no races)
+    # and the rows are reduced at the end. Returns (wins, ties, outcomes).
+    cdef int n = len(alive_bits)
+    cdef int n_players = len(hole_masks)
+    cdef int kk = k
+    cdef int n_first = n - kk + 1
+    cdef uint64_t board = board_mask
+    cdef uint64_t *bits = <uint64_t *>malloc(n * sizeof(uint64_t))
+    cdef uint64_t *holes = <uint64_t *>malloc(n_players * sizeof(uint64_t))
+    cdef int64_t *wins2 = <int64_t *>calloc(n_first * n_players,
+                                            sizeof(int64_t))
+    cdef int64_t *ties2 = <int64_t *>calloc(n_first * n_players,
+                                            sizeof(int64_t))
+    cdef int64_t *counts = <int64_t *>calloc(n_first, sizeof(int64_t))
+    cdef int *ranks_all = <int *>malloc(n_first * n_players * sizeof(int))
+    cdef int *idx_all = <int *>malloc(n_first * 5 * sizeof(int))
+    cdef int *idx
+    cdef int *ranks
+    cdef int i0, i, j, p, best, count
+    cdef uint64_t runout
+    cdef int64_t outcomes = 0
+    for i in range(n):
+        bits[i] = alive_bits[i]
+    for p in range(n_players):
+        holes[p] = hole_masks[p]
+    for i0 in prange(n_first, nogil=True, schedule='dynamic'):
+        idx = idx_all + i0 * 5
+        ranks = ranks_all + i0 * n_players
+        for i in range(kk):
+            idx[i] = i0 + i
+        while True:
+            runout = board
+            for j in range(kk):
+                runout = runout | bits[idx[j]]
+            for p in range(n_players):
+                ranks[p] = eval7_mask(runout | holes[p])
+            best = ranks[0]
+            for p in range(1, n_players):
+                if ranks[p] > best:
+                    best = ranks[p]
+            count = 0
+            for p in range(n_players):
+                if ranks[p] == best:
+                    count = count + 1
+            for p in range(n_players):
+                if ranks[p] == best:
+                    if count == 1:
+                        wins2[i0 * n_players + p] += 1
+                    else:
+                        ties2[i0 * n_players + p] += 1
+            counts[i0] += 1
+            # Only positions past the pinned first index advance.
+            i = kk - 1
+            while i >= 1 and idx[i] == n - kk + i:
+                i = i - 1
+            if i < 1:
+                break
+            idx[i] += 1
+            for j in range(i + 1, kk):
+                idx[j] = idx[j - 1] + 1
+    win_list = [0] * n_players
+    tie_list = [0] * n_players
+    for i0 in range(n_first):
+        outcomes += counts[i0]
+        for p in range(n_players):
+            win_list[p] += wins2[i0 * n_players + p]
+            tie_list[p] += ties2[i0 * n_players + p]
+    free(bits)
+    free(holes)
+    free(wins2)
+    free(ties2)
+    free(counts)
+    free(ranks_all)
+    free(idx_all)
+    return win_list, tie_list, outcomes
@@ -0,0 +1,15 @@
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+# Builds the optional compiled evaluator:
+#   python setup.py build_ext --inplace
+extensions = [
+    Extension(
+        "evaluator",
+        ["evaluator.pyx"],
+        extra_compile_args=["-O3", "-fopenmp"],
+        extra_link_args=["-fopenmp"],
+    ),
+]
+
+setup(ext_modules=cythonize(extensions, language_level=3))